@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+# Compares CPU training throughput (samples/s, time-to-target-loss) of the default setup
+# against the throughput mode from training_config.py on the daily dataset. The throughput run
+# keeps the baseline learning rate, so it isolates the runtime changes; a third run adds the
+# linear learning-rate scaling rule, which is an optimization change rather than a throughput one.
+# TensorFlow's thread pools cannot be reconfigured once started, so each run gets its own process.
+
+DATA_FILE = '../Climate_Energy_Consumption_Dataset_2020_2024.csv'
+TIME_STEPS = 7
+BENCHMARK_EPOCHS = 5
+TARGET_LOSS = 0.05 # val_loss (MSE on the 0-1 scaled target)
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+CONFIGS = {
+    "baseline (float64, batch 64)": [
+        "--no-float32", "--no-xla", "--batch-size", "64"
+    ],
+    "throughput (float32, XLA, batch 256)": [
+        "--float32", "--xla", "--batch-size", "256", "--no-scale-lr",
+        "--intra-op-threads", str(os.cpu_count() or 1), "--inter-op-threads", "2"
+    ],
+    "throughput + scaled LR (batch 256)": [
+        "--float32", "--xla", "--batch-size", "256", "--scale-lr",
+        "--intra-op-threads", str(os.cpu_count() or 1), "--inter-op-threads", "2"
+    ]
+}
+
+def run_single():
+    """Trains for a fixed number of epochs under the command-line config and prints the summary."""
+    import pandas as pd
+    from pipeline_utils import build_lstm_model, chronological_holdout
+    from daily_pipeline import preprocess_daily, scale_and_window
+    from training_config import parse_training_args, configure_runtime, ThroughputMonitor
+
+    config = parse_training_args([arg for arg in sys.argv[1:] if arg != "--single"])
+    configure_runtime(config)
+
+    df, _ = preprocess_daily(pd.read_csv(DATA_FILE))
+    X_train, _, y_train, _, _, _ = scale_and_window(df, TIME_STEPS, dtype=config.dtype)
+    X_train, X_val, y_train, y_val = chronological_holdout(X_train, y_train, fraction=config.validation_fraction)
+
+    model = build_lstm_model(TIME_STEPS, X_train.shape[2], learning_rate=config.learning_rate, jit_compile=config.jit_compile)
+    monitor = ThroughputMonitor(len(X_train), config.target_loss)
+    model.fit(X_train, y_train, epochs=config.max_epochs, batch_size=config.batch_size,
+              validation_data=(X_val, y_val), callbacks=[monitor], verbose=0)
+
+    print(RESULT_PREFIX + json.dumps(dict(monitor.summary(), config=config.as_dict())))
+
+def run_benchmark():
+    results = {}
+    for name, args in CONFIGS.items():
+        print(f"Running {name}...")
+        cmd = [sys.executable, os.path.abspath(__file__), "--single", *args,
+               "--max-epochs", str(BENCHMARK_EPOCHS), "--target-loss", str(TARGET_LOSS)]
+        output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        line = next(l for l in output.splitlines() if l.startswith(RESULT_PREFIX))
+        results[name] = json.loads(line[len(RESULT_PREFIX):])
+
+    print(f"\n{'Configuration':<40}{'LR':>8}{'Samples/s':>12}{'Time to target (s)':>22}{'Total (s)':>12}")
+    for name, result in results.items():
+        ttt = result['time_to_target_loss']
+        ttt_text = f"{ttt:.1f}" if ttt is not None else "not reached"
+        print(f"{name:<40}{result['config']['learning_rate']:>8g}{result['samples_per_sec']:>12,.0f}{ttt_text:>22}{result['total_time']:>12.1f}")
+
+    baseline, tuned, scaled = results.values()
+    if baseline['samples_per_sec']:
+        print(f"\nThroughput speed-up (same learning rate): {tuned['samples_per_sec'] / baseline['samples_per_sec']:.2f}x")
+    print("Note: the scaled-LR run also changes the learning rate, so its time to target mixes "
+          "an optimization change with the throughput change.")
+
+if __name__ == "__main__":
+    if "--single" in sys.argv:
+        run_single()
+    else:
+        run_benchmark()
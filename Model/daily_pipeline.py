@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, LabelEncoder
+
+from pipeline_utils import cyclical_encode, create_sequences
+
+# Daily country-level data (Climate_Energy_Consumption_Dataset_2020_2024.csv)
+TARGET = 'energy_consumption'
+
+def preprocess_daily(df, label_encoder=None):
+    """Data Preprocessing & Feature Engineering Layer for the daily dataset.
+
+    Returns the engineered frame (target as the last column) and the fitted country LabelEncoder.
+    """
+    df = df.copy()
+    # Convert date to datetime and extract temporal features
+    df['date'] = pd.to_datetime(df['date'])
+    df['month'] = df['date'].dt.month
+    df['day_of_week'] = df['date'].dt.dayofweek
+
+    # Cyclical encoding for time variables (Sine/Cosine transformations)
+    df['month_sin'], df['month_cos'] = cyclical_encode(df['month'], 12)
+
+    # Encode categorical 'country' variable
+    if label_encoder is None:
+        label_encoder = LabelEncoder()
+        label_encoder.fit(df['country'])
+    df['country_encoded'] = label_encoder.transform(df['country'])
+
+    # Drop non-numeric/original categorical columns to prepare for scaling
+    df = df.drop(['date', 'country', 'month'], axis=1)
+
+    # Ensure 'energy_consumption' is the last column for easier sequence generation
+    cols = [c for c in df.columns if c != TARGET] + [TARGET]
+    return df[cols], label_encoder
+
+def scale_and_window(df, time_steps, dtype=np.float32, train_fraction=0.8):
+    """Normalization & Scaling plus the chronological Sliding Window split.
+
+    Returns X_train, X_test, y_train, y_test, scaler_X, scaler_y. Arrays are cast to `dtype`
+    once here so TensorFlow does not receive the scalers' float64 output.
+    """
+    scaler_X = MinMaxScaler()
+    scaler_y = MinMaxScaler()
+
+    # Scale features and target separately so we can inverse_transform the predictions later
+    X_scaled = scaler_X.fit_transform(df.drop(TARGET, axis=1))
+    y_scaled = scaler_y.fit_transform(df[[TARGET]])
+
+    # Recombine temporarily to create sequences
+    scaled_data = np.hstack((X_scaled, y_scaled)).astype(dtype, copy=False)
+    X, y = create_sequences(scaled_data, time_steps)
+
+    # Chronological Split (80% Train, 20% Test) to prevent data leakage
+    split_idx = int(len(X) * train_fraction)
+    return X[:split_idx], X[split_idx:], y[:split_idx], y[split_idx:], scaler_X, scaler_y
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Batch drift & data-quality screening of an incoming feature file against the training data.
+# Produces one report (per country x feature) and exits non-zero when the file should not be
+# scored, so nightly jobs can gate on it:  python drift_screening.py incoming.csv || exit 1
+
+DATA_FILE = '../Climate_Energy_Consumption_Dataset_2020_2024.csv'
+DRIFT_FEATURES = [
+    'avg_temperature', 'humidity', 'co2_emission', 'renewable_share',
+    'urban_population', 'industrial_activity_index', 'energy_price'
+]
+Z_THRESHOLD = 2.0            # Same cut-off as the prediction screen's per-input drift warning
+MAX_OUTLIER_FRACTION = 0.10  # |z| > 2 covers ~5% of a normal distribution; twice that is suspicious
+MAX_MISSING_FRACTION = 0.05
+PSI_BINS = 10
+PSI_WARN, PSI_FAIL = 0.1, 0.25
+KS_ALPHA_COEFFICIENT = 1.628 # c(alpha) for a two-sample KS test at alpha = 0.01
+# PSI/KS are meaningless on a handful of rows (e.g. one nightly day per country); below this,
+# a country is screened on missing values and z-score outliers only and reported 'insufficient'.
+# At 100 rows, 10-bin PSI noise alone still fails clean samples of the training data; 200 does not.
+MIN_ROWS_FOR_DISTRIBUTION = 200
+
+def population_stability_index(reference, incoming, bins=PSI_BINS):
+    """PSI over reference-quantile bins; empty bins are floored to avoid log(0)."""
+    edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1)))
+    if len(edges) < 3:
+        return 0.0 # Near-constant reference: nothing to compare
+    inner = edges[1:-1]
+    ref_share = np.bincount(np.searchsorted(inner, reference, side='right'), minlength=len(inner) + 1) / len(reference)
+    new_share = np.bincount(np.searchsorted(inner, incoming, side='right'), minlength=len(inner) + 1) / len(incoming)
+    ref_share = np.clip(ref_share, 1e-6, None)
+    new_share = np.clip(new_share, 1e-6, None)
+    return float(np.sum((new_share - ref_share) * np.log(new_share / ref_share)))
+
+def ks_statistic(reference, incoming):
+    """Two-sample Kolmogorov-Smirnov statistic: the largest gap between the two empirical CDFs."""
+    reference, incoming = np.sort(reference), np.sort(incoming)
+    points = np.concatenate([reference, incoming])
+    cdf_ref = np.searchsorted(reference, points, side='right') / len(reference)
+    cdf_new = np.searchsorted(incoming, points, side='right') / len(incoming)
+    return float(np.max(np.abs(cdf_ref - cdf_new)))
+
+def distribution_stats(country, reference, incoming):
+    """Worker: PSI and KS for every feature of one country. Inputs are (rows, features) arrays."""
+    rows = []
+    for i, feature in enumerate(DRIFT_FEATURES):
+        ref_col = reference[:, i][~np.isnan(reference[:, i])]
+        new_col = incoming[:, i][~np.isnan(incoming[:, i])]
+        if len(ref_col) == 0 or len(new_col) < MIN_ROWS_FOR_DISTRIBUTION:
+            rows.append({'country': country, 'feature': feature, 'psi': np.nan, 'ks': np.nan, 'ks_critical': np.nan})
+            continue
+        rows.append({
+            'country': country,
+            'feature': feature,
+            'psi': population_stability_index(ref_col, new_col),
+            'ks': ks_statistic(ref_col, new_col),
+            'ks_critical': KS_ALPHA_COEFFICIENT * np.sqrt((len(ref_col) + len(new_col)) / (len(ref_col) * len(new_col)))
+        })
+    return rows
+
+def screen_file(incoming_df, reference_df, workers=None):
+    """Screens a whole incoming file at once and returns the per-country, per-feature report."""
+    missing_columns = [c for c in ['country'] + DRIFT_FEATURES if c not in incoming_df.columns]
+    if missing_columns:
+        raise ValueError(f"Incoming file is missing columns: {missing_columns}")
+    if incoming_df.empty:
+        # A truncated or empty export is exactly what the gate has to block
+        return pd.DataFrame({'country': ['*'], 'feature': ['*'], 'rows': [0], 'status': ['fail']})
+
+    known = incoming_df['country'].isin(reference_df['country'].unique())
+    incoming = incoming_df[known]
+
+    # Z-score outliers for every row in one vectorized pass, using each country's training mean/std
+    ref_groups = reference_df.groupby('country')[DRIFT_FEATURES]
+    means = ref_groups.mean().reindex(incoming['country']).to_numpy()
+    stds = ref_groups.std().replace(0, 1e-6).reindex(incoming['country']).to_numpy()
+    values = incoming[DRIFT_FEATURES].to_numpy(dtype=np.float64)
+    outliers = pd.DataFrame(np.abs((values - means) / stds) > Z_THRESHOLD, columns=DRIFT_FEATURES, index=incoming.index)
+
+    by_country = incoming['country']
+    report = pd.concat({
+        'missing': incoming[DRIFT_FEATURES].isna().groupby(by_country).sum().stack(),
+        'outliers': outliers.groupby(by_country).sum().stack()
+    }, axis=1)
+    report.index.names = ['country', 'feature']
+    report['rows'] = by_country.value_counts().reindex(report.index.get_level_values('country')).to_numpy()
+
+    # PSI / KS need each country's full distributions: fan the countries out across processes
+    ref_arrays = {c: g[DRIFT_FEATURES].to_numpy(dtype=np.float64) for c, g in reference_df.groupby('country')}
+    jobs = [(c, ref_arrays[c], g[DRIFT_FEATURES].to_numpy(dtype=np.float64)) for c, g in incoming.groupby('country')]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = pool.map(distribution_stats, *zip(*jobs))
+            dist_rows = [row for rows in results for row in rows]
+    else:
+        dist_rows = [row for job in jobs for row in distribution_stats(*job)]
+    dist = pd.DataFrame(dist_rows, columns=['country', 'feature', 'psi', 'ks', 'ks_critical']).set_index(['country', 'feature'])
+    report = report.join(dist).reset_index()
+
+    report['missing_fraction'] = report['missing'] / report['rows']
+    report['outlier_fraction'] = report['outliers'] / (report['rows'] - report['missing']).clip(lower=1)
+
+    fail = (report['missing_fraction'] > MAX_MISSING_FRACTION) | (report['psi'] >= PSI_FAIL) | (report['ks'] > report['ks_critical'])
+    warn = (report['psi'] >= PSI_WARN) | (report['outlier_fraction'] > MAX_OUTLIER_FRACTION)
+    insufficient = report['psi'].isna()
+    report['status'] = np.select([fail, warn, insufficient], ['fail', 'warn', 'insufficient'], default='ok')
+
+    # Rows we cannot screen at all are reported rather than silently dropped
+    unknown = incoming_df.loc[~known, 'country'].fillna('<missing>').value_counts()
+    if not unknown.empty:
+        unknown_rows = pd.DataFrame({'country': unknown.index, 'feature': '*', 'rows': unknown.to_numpy(), 'status': 'fail'})
+        report = pd.concat([report, unknown_rows], ignore_index=True)
+    return report
+
+def summarize(report):
+    return {
+        'passed': bool((report['status'] != 'fail').all()),
+        'rows_screened': int(report.drop_duplicates('country')['rows'].sum()),
+        'status_counts': {status: int(n) for status, n in report['status'].value_counts().items()},
+        'failures': report.loc[report['status'] == 'fail', ['country', 'feature']].to_dict(orient='records')
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch drift and data-quality screening")
+    parser.add_argument('incoming', help="CSV with the same columns as the training dataset")
+    parser.add_argument('--reference', default=DATA_FILE)
+    parser.add_argument('--report', default='drift_report.csv', help="Per-country, per-feature report (CSV); a JSON summary is written next to it")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    report = screen_file(pd.read_csv(args.incoming), pd.read_csv(args.reference), workers=args.workers)
+    report.to_csv(args.report, index=False)
+    summary = summarize(report)
+    with open(os.path.splitext(args.report)[0] + '.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Screened {summary['rows_screened']:,} rows: {summary['status_counts']}")
+    print(f"Report written to '{args.report}'.")
+    if not summary['passed']:
+        print(f"DATA QUALITY GATE FAILED: {len(summary['failures'])} country/feature checks failed.")
+        sys.exit(1)
+    print("Data quality gate passed.")
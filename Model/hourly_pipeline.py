@@ -0,0 +1,113 @@
+import os
+import numpy as np
+import pandas as pd
+import joblib
+import tensorflow as tf
+
+from pipeline_utils import cyclical_encode, window_starts, make_window_dataset, batched_predict
+
+# Hourly building-level telemetry (Energy_consumption_dataset.csv)
+TARGET = 'EnergyConsumption'
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Two-state categorical columns: (value that encodes to 1, value that encodes to 0)
+BINARY_COLUMNS = {'Holiday': ('Yes', 'No'), 'HVACUsage': ('On', 'Off'), 'LightingUsage': ('On', 'Off')}
+HOURLY_FEATURES = [
+    'Temperature', 'Humidity', 'SquareFootage', 'Occupancy', 'RenewableEnergy',
+    'Holiday', 'HVACUsage', 'LightingUsage', 'day_of_week',
+    'hour_sin', 'hour_cos', 'month_sin', 'month_cos'
+]
+HOURLY_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_models', 'hourly')
+
+def encode_categorical(values, categories):
+    """Maps values to their position in `categories`; raises ValueError on anything else (including NaN)."""
+    codes = pd.Categorical(values, categories=categories).codes
+    if (codes < 0).any():
+        unknown = sorted(values[codes < 0].astype(str).unique())
+        raise ValueError(f"Unknown {values.name} values: {unknown} (expected one of {categories})")
+    return codes.astype(np.float32)
+
+def consecutive_runs(df):
+    """Labels every row with the id of its run of consecutive hourly readings.
+
+    A row continues the run when its Hour/DayOfWeek/Month are exactly one hour after the previous
+    row's; anything else (a gap, a repeat, shuffled rows) starts a new run. Windows are only cut
+    inside a run, so a window always spans `time_steps` real consecutive hours.
+    """
+    hour = df['Hour'].to_numpy()
+    day = encode_categorical(df['DayOfWeek'], DAY_ORDER).astype(np.int64)
+    month = df['Month'].to_numpy()
+
+    new_day = hour[:-1] == 23
+    continues = (
+        (hour[1:] == (hour[:-1] + 1) % 24)
+        & (day[1:] == np.where(new_day, (day[:-1] + 1) % 7, day[:-1]))
+        & ((month[1:] == month[:-1]) | (new_day & (month[1:] == month[:-1] % 12 + 1)))
+    )
+    return np.concatenate([[0], np.cumsum(~continues)])
+
+def preprocess_hourly(df):
+    """Vectorized Preprocessing & Feature Engineering Layer for the hourly dataset.
+
+    Returns a float32 frame with HOURLY_FEATURES (plus TARGET when present) in a fixed order.
+    """
+    columns = {col: df[col].astype(np.float32) for col in ['Temperature', 'Humidity', 'SquareFootage', 'Occupancy', 'RenewableEnergy']}
+
+    # Categorical columns map through fixed vocabularies, so train and inference always agree
+    for col, (positive, negative) in BINARY_COLUMNS.items():
+        columns[col] = encode_categorical(df[col], [negative, positive])
+    columns['day_of_week'] = encode_categorical(df['DayOfWeek'], DAY_ORDER)
+
+    columns['hour_sin'], columns['hour_cos'] = cyclical_encode(df['Hour'], 24)
+    columns['month_sin'], columns['month_cos'] = cyclical_encode(df['Month'], 12)
+
+    ordered = HOURLY_FEATURES + ([TARGET] if TARGET in df.columns else [])
+    if TARGET in df.columns:
+        columns[TARGET] = df[TARGET].astype(np.float32)
+    return pd.DataFrame({col: columns[col] for col in ordered}, index=df.index)
+
+class HourlyPredictor:
+    """Batched inference for the hourly model trained by train_hourly_model.py."""
+
+    def __init__(self, model_dir=HOURLY_MODEL_DIR):
+        self.model = tf.keras.models.load_model(os.path.join(model_dir, 'lstm_hourly_model.h5'))
+        self.scaler_X = joblib.load(os.path.join(model_dir, 'scaler_X.pkl'))
+        self.scaler_y = joblib.load(os.path.join(model_dir, 'scaler_y.pkl'))
+        self.time_steps = self.model.input_shape[1]
+
+    def predict(self, df, batch_size=1024):
+        """Forecasts the hour following every complete window of consecutive hours in `df`.
+
+        The result is indexed by the last row of each window; windows that cross a break in the
+        hourly sequence (see consecutive_runs) are skipped.
+        """
+        starts = window_starts(consecutive_runs(df), self.time_steps) if len(df) else []
+        if len(starts) == 0:
+            return pd.Series([], dtype=np.float32, name='predicted_next_hour')
+        features = preprocess_hourly(df)[HOURLY_FEATURES]
+        scaled = self.scaler_X.transform(features).astype(np.float32, copy=False)
+        dataset = make_window_dataset(scaled, self.time_steps, starts=starts, batch_size=batch_size)
+        scaled_pred = batched_predict(self.model, dataset)
+        pred = self.scaler_y.inverse_transform(scaled_pred.reshape(-1, 1))[:, 0]
+        return pd.Series(pred, index=df.index[starts + self.time_steps - 1], name='predicted_next_hour')
+
+    def predict_file(self, path, chunksize=100_000, batch_size=1024):
+        """Streams a large CSV in chunks, carrying the last time_steps - 1 rows across chunk boundaries."""
+        carry = None
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if carry is not None:
+                chunk = pd.concat([carry, chunk])
+            yield self.predict(chunk, batch_size=batch_size)
+            carry = chunk.iloc[-(self.time_steps - 1):] if self.time_steps > 1 else None
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python hourly_pipeline.py <hourly_telemetry.csv> [output.csv]")
+        sys.exit(1)
+    predictor = HourlyPredictor()
+    results = pd.concat(list(predictor.predict_file(sys.argv[1])))
+    if len(sys.argv) > 2:
+        results.to_csv(sys.argv[2])
+        print(f"Wrote {len(results):,} hourly forecasts to '{sys.argv[2]}'.")
+    else:
+        print(results.describe())
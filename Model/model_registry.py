@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import stat
+import tempfile
+
+# Versioned, immutable store for training runs. Layout:
+#   registry/versions/<version>/manifest.json   hashes, feature order, metrics
+#   registry/versions/<version>/<artifacts>      model, scalers, encoders (read-only)
+#   registry/CURRENT                             name of the version running screens should serve
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_models', 'registry')
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def atomic_write(path, text):
+    """Writes to a temp file and renames it, so readers see either the old or the new content."""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def remove_tree(path):
+    """rmtree that also clears the read-only bit set on published artifacts (needed on Windows)."""
+    def make_writable_and_retry(func, failed_path, _):
+        os.chmod(failed_path, stat.S_IWRITE)
+        func(failed_path)
+    shutil.rmtree(path, onerror=make_writable_and_retry)
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.current_path = os.path.join(root, 'CURRENT')
+
+    def version_dir(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def current_version(self):
+        """Name of the current version, or None when nothing has been published yet."""
+        try:
+            with open(self.current_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self):
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(v for v in os.listdir(self.versions_dir) if not v.startswith('.'))
+
+    def read_manifest(self, version=None):
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No current model version in '{self.root}'.")
+        with open(os.path.join(self.version_dir(version), 'manifest.json')) as f:
+            return json.load(f)
+
+    def verify(self, version):
+        """Re-hashes every artifact; raises ValueError if any differs from the manifest."""
+        manifest = self.read_manifest(version)
+        for rel_path, expected in manifest['artifacts'].items():
+            if file_sha256(os.path.join(self.version_dir(version), rel_path)) != expected:
+                raise ValueError(f"Artifact '{rel_path}' of version {version} does not match its manifest hash.")
+        return manifest
+
+    def publish(self, artifacts, feature_order, metrics=None, time_steps=None, inherit_current=False, make_current=True):
+        """Copies a training run into a new immutable version and (by default) makes it current.
+
+        `artifacts` maps a name inside the version to a source file or directory. With
+        `inherit_current`, artifacts of the current version that are not replaced are carried over.
+        """
+        parent = self.current_version()
+        os.makedirs(self.versions_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.versions_dir)
+
+        try:
+            if inherit_current and parent is not None:
+                parent_dir = self.version_dir(parent)
+                for rel_path in self.read_manifest(parent)['artifacts']:
+                    if rel_path.split('/')[0] in artifacts:
+                        continue
+                    target = os.path.join(staging_dir, rel_path)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(os.path.join(parent_dir, rel_path), target)
+
+            for name, source in artifacts.items():
+                target = os.path.join(staging_dir, name)
+                if os.path.isdir(source):
+                    shutil.copytree(source, target, ignore=shutil.ignore_patterns('checkpoints'))
+                else:
+                    shutil.copy2(source, target)
+
+            hashes = {}
+            for dir_path, _, file_names in os.walk(staging_dir):
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    hashes[os.path.relpath(path, staging_dir).replace(os.sep, '/')] = file_sha256(path)
+                    os.chmod(path, 0o444) # Versions are immutable once published
+
+            # Identical content published twice in the same second gets a numbered suffix
+            content_hash = hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest()
+            base_version = f"v{time.strftime('%Y%m%d-%H%M%S')}-{content_hash[:8]}"
+            version, suffix = base_version, 1
+            while os.path.exists(self.version_dir(version)):
+                suffix += 1
+                version = f"{base_version}-{suffix}"
+
+            manifest = {
+                'version': version,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'parent': parent,
+                'feature_order': list(feature_order),
+                'time_steps': time_steps,
+                'metrics': metrics or {},
+                'artifacts': hashes
+            }
+            with open(os.path.join(staging_dir, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            # The version appears fully written or not at all
+            os.replace(staging_dir, self.version_dir(version))
+        except BaseException:
+            remove_tree(staging_dir)
+            raise
+
+        if make_current:
+            self.set_current(version)
+        return version
+
+    def set_current(self, version):
+        """Points running screens at `version` (also used to roll back)."""
+        if not os.path.isfile(os.path.join(self.version_dir(version), 'manifest.json')):
+            raise ValueError(f"Unknown model version: {version}")
+        atomic_write(self.current_path, version + '\n')
+
+if __name__ == "__main__":
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    if command == 'list':
+        current = registry.current_version()
+        for version in registry.list_versions():
+            metrics = registry.read_manifest(version)['metrics']
+            print(f"{'*' if version == current else ' '} {version}  {metrics}")
+    elif command == 'promote' and len(sys.argv) > 2:
+        registry.verify(sys.argv[2])
+        registry.set_current(sys.argv[2])
+        print(f"Current model version is now {sys.argv[2]}.")
+    else:
+        print("Usage: python model_registry.py [list | promote <version>]")
+        sys.exit(1)
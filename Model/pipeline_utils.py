@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.ensemble import RandomForestRegressor
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import LSTM, Dense, Dropout
+
+# Shared layers of the training pipeline, used by both the daily country model
+# (train_model.py) and the hourly building model (train_hourly_model.py).
+
+def cyclical_encode(values, period):
+    """Sine/Cosine transformation so that e.g. hour 23 sits next to hour 0."""
+    angle = 2 * np.pi * np.asarray(values, dtype=np.float32) / period
+    return np.sin(angle), np.cos(angle)
+
+def create_sequences(data, time_steps):
+    """Creates 3D tensors for LSTM input (Sliding Window Cross-Validation).
+
+    The windows are a strided view over `data`, so no per-window copies are made.
+    Window i covers rows i..i+time_steps-1 and its target is the next row's last column.
+    """
+    windows = sliding_window_view(data[:-1, :-1], time_steps, axis=0) # (samples, features, time_steps)
+    X = windows.transpose(0, 2, 1)                                   # (samples, time_steps, features)
+    y = data[time_steps:, -1]
+    return X, y
+
+def chronological_holdout(*arrays, fraction=0.1):
+    """Splits the last `fraction` off each array, keeping time order: (a_head, a_tail, b_head, b_tail, ...)."""
+    split = len(arrays[0]) - max(1, int(len(arrays[0]) * fraction))
+    return [part for array in arrays for part in (array[:split], array[split:])]
+
+def window_starts(run_ids, window_length):
+    """Start rows of every window of `window_length` rows that lies inside a single run.
+
+    `run_ids` labels each row with its run of consecutive readings and never decreases, so a
+    window is unbroken exactly when its first and last rows share a label.
+    """
+    run_ids = np.asarray(run_ids)
+    if len(run_ids) < window_length:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(run_ids[window_length - 1:] == run_ids[:len(run_ids) - window_length + 1])
+
+def make_window_dataset(features, time_steps, targets=None, starts=None, batch_size=64, shuffle=False):
+    """Streams sliding windows in batches with tf.data instead of materializing the 3D tensor.
+
+    Window i covers rows i..i+time_steps-1; with targets it is paired with targets[i + time_steps],
+    matching create_sequences. `starts` selects which windows to yield (default: all of them);
+    each batch is gathered from the rows on the fly.
+    """
+    if starts is None:
+        starts = np.arange(len(features) - time_steps + (1 if targets is None else 0))
+    features = tf.constant(features)
+    offsets = tf.range(time_steps, dtype=tf.int64)
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(starts, dtype=np.int64))
+    if shuffle:
+        dataset = dataset.shuffle(len(starts), reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+    if targets is None:
+        dataset = dataset.map(lambda s: tf.gather(features, s[:, None] + offsets))
+    else:
+        targets = tf.constant(targets)
+        dataset = dataset.map(lambda s: (tf.gather(features, s[:, None] + offsets), tf.gather(targets, s + time_steps)))
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+def rank_feature_importance(X, y, sample_size=None, random_state=42):
+    """Feature Selection Layer: Random Forest importances, optionally on a row sample for large data."""
+    if sample_size is not None and len(X) > sample_size:
+        X = X.sample(n=sample_size, random_state=random_state)
+        y = y.loc[X.index]
+    rf_model = RandomForestRegressor(n_estimators=50, random_state=random_state, n_jobs=-1)
+    rf_model.fit(X, y)
+    return pd.Series(rf_model.feature_importances_, index=X.columns).sort_values(ascending=False)
+
+def build_lstm_model(time_steps, n_features, learning_rate=0.001, jit_compile=False, lstm_units=(64, 32)):
+    """AI Modelling Core: stacked LSTM regressor predicting a single consumption value."""
+    model = Sequential()
+    # Input layer matches the 3D tensor shape (Time_Steps, Features)
+    model.add(LSTM(units=lstm_units[0], return_sequences=True, input_shape=(time_steps, n_features)))
+    model.add(Dropout(0.2)) # Mitigates overfitting
+    model.add(LSTM(units=lstm_units[1], return_sequences=False))
+    model.add(Dropout(0.2))
+    model.add(Dense(units=16, activation='relu'))
+    model.add(Dense(units=1)) # Output layer for predicting a single energy consumption value
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate), loss='mean_squared_error',
+                  jit_compile=jit_compile)
+    return model
+
+def batched_predict(model, inputs, batch_size=1024):
+    """Runs inference over an array or tf.data dataset in fixed-size batches; returns a flat array."""
+    if isinstance(inputs, tf.data.Dataset):
+        return model.predict(inputs, verbose=0).reshape(-1)
+    return model.predict(inputs, batch_size=batch_size, verbose=0).reshape(-1)
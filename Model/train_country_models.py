@@ -0,0 +1,142 @@
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+
+import pandas as pd
+import joblib
+from sklearn.metrics import mean_absolute_error
+
+from pipeline_utils import build_lstm_model, chronological_holdout
+from daily_pipeline import preprocess_daily, scale_and_window, TARGET
+from training_config import parse_training_args, configure_runtime, training_callbacks
+from model_registry import ModelRegistry, remove_tree
+
+# Trains one small LSTM per country (or per cluster of similar countries) in a process pool.
+# The prediction screen's CountryModelRouter dispatches each request to its country's model.
+
+DATA_FILE = '../Climate_Energy_Consumption_Dataset_2020_2024.csv'
+TIME_STEPS = 7
+COUNTRY_MODEL_DIR = 'saved_models/countries'
+COUNTRY_LSTM_UNITS = (32, 16) # Half the width of the global model: each one sees a single country's patterns
+
+def slugify(name):
+    return name.lower().replace(' ', '_')
+
+def cluster_countries(raw_df, n_clusters):
+    """Groups countries with similar average climate/energy profiles using KMeans."""
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+    profiles = raw_df.groupby('country').mean(numeric_only=True)
+    labels = KMeans(n_clusters=n_clusters, n_init=10, random_state=42).fit_predict(StandardScaler().fit_transform(profiles))
+    return {country: f"cluster_{label}" for country, label in zip(profiles.index, labels)}
+
+def train_group(group_name, frame, config, output_dir):
+    """Worker: trains, evaluates and saves the model for one country/cluster."""
+    configure_runtime(config)
+    start = time.perf_counter()
+
+    X_train, X_test, y_train, y_test, scaler_X, scaler_y = scale_and_window(frame, TIME_STEPS, dtype=config.dtype)
+    X_train, X_val, y_train, y_val = chronological_holdout(X_train, y_train, fraction=config.validation_fraction)
+    model = build_lstm_model(TIME_STEPS, X_train.shape[2], learning_rate=config.learning_rate,
+                             jit_compile=config.jit_compile, lstm_units=COUNTRY_LSTM_UNITS)
+
+    group_dir = os.path.join(output_dir, group_name)
+    callbacks, _ = training_callbacks(config, os.path.join(group_dir, 'checkpoints', 'best.h5'), len(X_train))
+    history = model.fit(X_train, y_train, epochs=config.max_epochs, batch_size=config.batch_size,
+                        validation_data=(X_val, y_val), callbacks=callbacks, verbose=0)
+
+    model.save(os.path.join(group_dir, 'lstm_energy_model.h5'))
+    joblib.dump(scaler_X, os.path.join(group_dir, 'scaler_X.pkl'))
+    joblib.dump(scaler_y, os.path.join(group_dir, 'scaler_y.pkl'))
+
+    y_pred = scaler_y.inverse_transform(model.predict(X_test, verbose=0))
+    y_actual = scaler_y.inverse_transform(y_test.reshape(-1, 1))
+    return {
+        'group': group_name,
+        'rows': len(frame),
+        'epochs': len(history.history['loss']),
+        'mae': float(mean_absolute_error(y_actual, y_pred)),
+        'params': int(model.count_params()),
+        'train_time': time.perf_counter() - start
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-country LSTM training in a process pool")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--clusters', type=int, default=0, help="Group countries into N clusters instead of one model each")
+    args, training_argv = parser.parse_known_args()
+    config = parse_training_args(training_argv)
+
+    # Split the cores between workers unless threads were set explicitly, to avoid oversubscription
+    threads_per_worker = max(1, (os.cpu_count() or 1) // args.workers)
+    config = replace(config,
+                     intra_op_threads=config.intra_op_threads or threads_per_worker,
+                     inter_op_threads=config.inter_op_threads or 1)
+
+    print("1. Data Ingestion Layer...")
+    raw_df = pd.read_csv(DATA_FILE)
+
+    print("2. Data Preprocessing & Feature Engineering Layer...")
+    # Encode countries once over the full dataset so every model sees the same country_encoded values
+    df, label_encoder = preprocess_daily(raw_df)
+    countries = label_encoder.inverse_transform(df['country_encoded'])
+
+    if args.clusters:
+        group_of = cluster_countries(raw_df, args.clusters)
+    else:
+        group_of = {country: slugify(country) for country in label_encoder.classes_}
+    groups = pd.Series(countries, index=df.index).map(group_of)
+
+    print(f"3. Training {groups.nunique()} models across {args.workers} worker processes...")
+    # Each run trains into a fresh directory that replaces COUNTRY_MODEL_DIR only once it is complete,
+    # so models from an earlier per-country or --clusters run never linger next to the new index
+    os.makedirs(os.path.dirname(COUNTRY_MODEL_DIR), exist_ok=True)
+    run_dir = tempfile.mkdtemp(prefix='.countries-', dir=os.path.dirname(COUNTRY_MODEL_DIR))
+    start = time.perf_counter()
+    results = []
+    try:
+        # 'spawn' gives every worker a clean TensorFlow runtime (fork is unsafe once TF has started threads)
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(train_group, name, frame, config, run_dir)
+                       for name, frame in df.groupby(groups)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print(f"   {result['group']:<20} MAE {result['mae']:>10,.2f} kWh  ({result['epochs']} epochs, {result['train_time']:.1f}s)")
+
+        print("\n4. Writing router index...")
+        with open(os.path.join(run_dir, 'index.json'), 'w') as f:
+            json.dump({'time_steps': TIME_STEPS, 'groups': group_of}, f, indent=2)
+        joblib.dump(label_encoder, os.path.join(run_dir, 'label_encoder.pkl'))
+    except BaseException:
+        remove_tree(run_dir)
+        raise
+    if os.path.isdir(COUNTRY_MODEL_DIR):
+        remove_tree(COUNTRY_MODEL_DIR)
+    os.replace(run_dir, COUNTRY_MODEL_DIR)
+
+    summary = pd.DataFrame(results).set_index('group').sort_index()
+    print(summary)
+    print(f"\nWall-clock: {time.perf_counter() - start:.1f}s (sum of per-model time: {summary['train_time'].sum():.1f}s)")
+
+    print("\n5. Publishing to the Model Registry...")
+    registry = ModelRegistry()
+    if registry.current_version() is None:
+        print("No current version to extend; run train_model.py first to publish the global model.")
+    else:
+        # New version = current global model + these country models
+        version = registry.publish(
+            {'countries': COUNTRY_MODEL_DIR},
+            feature_order=df.drop(TARGET, axis=1).columns,
+            metrics=dict(registry.read_manifest()['metrics'], country_mae=summary['mae'].round(2).to_dict()),
+            time_steps=TIME_STEPS,
+            inherit_current=True
+        )
+        print(f"Published model version {version}.")
+    print("Per-country models are ready for the prediction screen's router.")
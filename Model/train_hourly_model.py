@@ -0,0 +1,116 @@
+import argparse
+import pandas as pd
+import numpy as np
+import os
+import joblib
+from sklearn.preprocessing import MinMaxScaler
+
+from pipeline_utils import chronological_holdout, window_starts, make_window_dataset, rank_feature_importance, build_lstm_model, batched_predict
+from hourly_pipeline import preprocess_hourly, consecutive_runs, HOURLY_FEATURES, TARGET, HOURLY_MODEL_DIR
+from training_config import parse_training_args, configure_runtime, training_callbacks
+
+# Define constants for the hourly building-level pipeline
+DATA_FILE = '../Energy_consumption_dataset.csv'
+WINDOW_CHOICES = (24, 168) # 1-day or 1-week sliding window of hourly readings
+RF_SAMPLE_SIZE = 50_000 # Feature importances are ranked on a sample once the telemetry grows
+
+parser = argparse.ArgumentParser(description="Hourly building-level LSTM training")
+parser.add_argument('--time-steps', type=int, choices=WINDOW_CHOICES, default=168, help="Window length in hours")
+args, training_argv = parser.parse_known_args()
+TIME_STEPS = args.time_steps
+
+# Threading, XLA, dtype, batch size and early stopping (see training_config.py / --help)
+config = parse_training_args(training_argv, batch_size=256)
+configure_runtime(config)
+print(f"Training configuration: {config.as_dict()}")
+
+print("1. Data Ingestion Layer...")
+df = pd.read_csv(DATA_FILE)
+
+print("2. Data Preprocessing & Feature Engineering Layer (vectorized)...")
+runs = consecutive_runs(df)
+df = preprocess_hourly(df)
+
+print("3. Feature Selection Layer (Random Forest)...")
+importances = rank_feature_importance(df[HOURLY_FEATURES], df[TARGET], sample_size=RF_SAMPLE_SIZE)
+print("\nFeature Importances Ranking:")
+print(importances)
+
+print("\n4. Normalization & Scaling...")
+scaler_X = MinMaxScaler()
+scaler_y = MinMaxScaler()
+X_scaled = scaler_X.fit_transform(df[HOURLY_FEATURES]).astype(config.dtype, copy=False)
+y_scaled = scaler_y.fit_transform(df[[TARGET]]).astype(config.dtype, copy=False)[:, 0]
+
+print("5. Time-Series Split (Sliding Window, streamed in batches)...")
+# A window and its target hour must be consecutive readings: windows crossing a break are dropped
+starts = window_starts(runs, TIME_STEPS + 1)
+n_skipped = max(len(df) - TIME_STEPS, 0) - len(starts)
+if len(starts) < 3:
+    raise ValueError(f"'{DATA_FILE}' has no run of {TIME_STEPS + 1} consecutive hourly rows to window.")
+if n_skipped:
+    print(f"Skipped {n_skipped:,} windows that cross a break in the hourly sequence ({runs[-1] + 1:,} consecutive runs).")
+
+# Chronological split over the valid windows. They are cut per batch by tf.data,
+# so the (samples, time_steps, features) tensor never exists in memory
+split_idx = int(len(starts) * 0.8)
+train_starts, test_starts = starts[:split_idx], starts[split_idx:]
+# Early stopping picks the epoch on the last training windows; the test windows are only scored at the end
+train_starts, val_starts = chronological_holdout(train_starts, fraction=config.validation_fraction)
+train_ds = make_window_dataset(X_scaled, TIME_STEPS, targets=y_scaled, starts=train_starts,
+                               batch_size=config.batch_size, shuffle=True)
+val_ds = make_window_dataset(X_scaled, TIME_STEPS, targets=y_scaled, starts=val_starts, batch_size=config.batch_size)
+test_ds = make_window_dataset(X_scaled, TIME_STEPS, targets=y_scaled, starts=test_starts, batch_size=config.batch_size)
+
+print(f"Training windows: {len(train_starts)}, Validation windows: {len(val_starts)}, "
+      f"Testing windows: {len(test_starts)}, Window: ({TIME_STEPS}, {len(HOURLY_FEATURES)})")
+
+print("6. AI Modelling Core (LSTM Network)...")
+model = build_lstm_model(TIME_STEPS, len(HOURLY_FEATURES),
+                         learning_rate=config.learning_rate, jit_compile=config.jit_compile)
+
+print("Training model (this may take a moment)...")
+callbacks, throughput = training_callbacks(config, os.path.join(HOURLY_MODEL_DIR, 'checkpoints', 'lstm_hourly_best.h5'), len(train_starts))
+history = model.fit(train_ds, epochs=config.max_epochs, validation_data=val_ds, callbacks=callbacks, verbose=1)
+print(f"Training throughput: {throughput.summary()}")
+
+print("\n7. Saving Models and Scalers...")
+os.makedirs(HOURLY_MODEL_DIR, exist_ok=True)
+model.save(os.path.join(HOURLY_MODEL_DIR, 'lstm_hourly_model.h5'))
+joblib.dump(scaler_X, os.path.join(HOURLY_MODEL_DIR, 'scaler_X.pkl'))
+joblib.dump(scaler_y, os.path.join(HOURLY_MODEL_DIR, 'scaler_y.pkl'))
+
+import matplotlib.pyplot as plt
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+print("\n8. Generating Evaluation Metrics & Visualization...")
+# Batched inference over the streamed test windows
+y_pred_scaled = batched_predict(model, test_ds)
+y_test = y_scaled[test_starts + TIME_STEPS]
+
+y_pred = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1))
+y_actual = scaler_y.inverse_transform(y_test.reshape(-1, 1))
+
+mae = mean_absolute_error(y_actual, y_pred)
+rmse = np.sqrt(mean_squared_error(y_actual, y_pred))
+
+print(f"Final Test MAE: {mae:,.2f} kWh")
+print(f"Final Test RMSE: {rmse:,.2f} kWh")
+
+# Plot (up to) one week of the test data for visual comparison
+slice_length = 168
+plt.figure(figsize=(12, 5))
+plt.plot(y_actual[:slice_length], label='Actual Demand (kWh)', color='#95a5a6', linewidth=2)
+plt.plot(y_pred[:slice_length], label='LSTM Predicted Demand (kWh)', color='#27ae60', linestyle='--', linewidth=2)
+
+plt.title('Hourly LSTM Model Evaluation: Actual vs Predicted Building Demand', fontsize=14, pad=15)
+plt.xlabel('Time (Hours)', fontsize=12)
+plt.ylabel('Energy Consumption (kWh)', fontsize=12)
+plt.legend(loc='upper right')
+plt.grid(True, linestyle=':', alpha=0.6)
+plt.tight_layout()
+
+plt.savefig('lstm_hourly_evaluation_chart.png', dpi=300)
+print("Saved evaluation chart as 'lstm_hourly_evaluation_chart.png'.")
+
+print("Hourly Pipeline Complete! Use hourly_pipeline.HourlyPredictor for batched inference.")
@@ -2,97 +2,55 @@ import pandas as pd
 import numpy as np
 import os
 import joblib
-from sklearn.preprocessing import MinMaxScaler, LabelEncoder
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+
+from pipeline_utils import rank_feature_importance, build_lstm_model, chronological_holdout
+from daily_pipeline import preprocess_daily, scale_and_window
+from training_config import parse_training_args, configure_runtime, training_callbacks
+from model_registry import ModelRegistry
 
 # Define constants based on the report's architecture
 DATA_FILE = '../Climate_Energy_Consumption_Dataset_2020_2024.csv'
 TIME_STEPS = 7 # 7-day sliding window for daily data
 
-def create_sequences(data, time_steps):
-    """Creates 3D tensors for LSTM input (Sliding Window Cross-Validation)."""
-    X, y = [], []
-    for i in range(len(data) - time_steps):
-        X.append(data[i:(i + time_steps), :-1]) # All features
-        y.append(data[i + time_steps, -1])     # Target variable (energy_consumption)
-    return np.array(X), np.array(y)
+# Threading, XLA, dtype, batch size and early stopping (see training_config.py / --help)
+config = parse_training_args()
+configure_runtime(config)
+print(f"Training configuration: {config.as_dict()}")
 
 print("1. Data Ingestion Layer...")
 df = pd.read_csv(DATA_FILE)
 
 print("2. Data Preprocessing & Feature Engineering Layer...")
-# Convert date to datetime and extract temporal features
-df['date'] = pd.to_datetime(df['date'])
-df['month'] = df['date'].dt.month
-df['day_of_week'] = df['date'].dt.dayofweek
-
-# Cyclical encoding for time variables (Sine/Cosine transformations)
-df['month_sin'] = np.sin(2 * np.pi * df['month']/12)
-df['month_cos'] = np.cos(2 * np.pi * df['month']/12)
-
-# Encode categorical 'country' variable
-label_encoder = LabelEncoder()
-df['country_encoded'] = label_encoder.fit_transform(df['country'])
-
-# Drop non-numeric/original categorical columns to prepare for scaling
-df = df.drop(['date', 'country', 'month'], axis=1)
-
-# Ensure 'energy_consumption' is the last column for easier sequence generation
-cols = [c for c in df.columns if c != 'energy_consumption'] + ['energy_consumption']
-df = df[cols]
+df, label_encoder = preprocess_daily(df)
 
 print("3. Feature Selection Layer (Random Forest)...")
 X_rf = df.drop('energy_consumption', axis=1)
 y_rf = df['energy_consumption']
 
-rf_model = RandomForestRegressor(n_estimators=50, random_state=42)
-rf_model.fit(X_rf, y_rf)
-
 # Display feature importances as dictated by the report
-importances = pd.Series(rf_model.feature_importances_, index=X_rf.columns).sort_values(ascending=False)
+importances = rank_feature_importance(X_rf, y_rf)
 print("\nFeature Importances Ranking:")
 print(importances)
 print("\n*Note: In a full pipeline, we would drop features with near-zero importance here.*")
 
 print("\n4. Normalization & Scaling...")
-scaler_X = MinMaxScaler()
-scaler_y = MinMaxScaler()
-
-# Scale features and target separately so we can inverse_transform the predictions later
-X_scaled = scaler_X.fit_transform(df.drop('energy_consumption', axis=1))
-y_scaled = scaler_y.fit_transform(df[['energy_consumption']])
-
-# Recombine temporarily to create sequences
-scaled_data = np.hstack((X_scaled, y_scaled))
-
 print("5. Time-Series Split (Sliding Window)...")
-X, y = create_sequences(scaled_data, TIME_STEPS)
+X_train, X_test, y_train, y_test, scaler_X, scaler_y = scale_and_window(df, TIME_STEPS, dtype=config.dtype)
+# Early stopping picks the epoch on the last days of the training period; the test set is only scored at the end
+X_train, X_val, y_train, y_val = chronological_holdout(X_train, y_train, fraction=config.validation_fraction)
 
-# Chronological Split (80% Train, 20% Test) to prevent data leakage
-split_idx = int(len(X) * 0.8)
-X_train, X_test = X[:split_idx], X[split_idx:]
-y_train, y_test = y[:split_idx], y[split_idx:]
-
-print(f"Training shape: {X_train.shape}, Testing shape: {X_test.shape}")
+print(f"Training shape: {X_train.shape}, Validation shape: {X_val.shape}, Testing shape: {X_test.shape}")
 
 print("6. AI Modelling Core (LSTM Network)...")
-model = Sequential()
-# Input layer matches the 3D tensor shape (Time_Steps, Features)
-model.add(LSTM(units=64, return_sequences=True, input_shape=(X_train.shape[1], X_train.shape[2])))
-model.add(Dropout(0.2)) # Mitigates overfitting
-model.add(LSTM(units=32, return_sequences=False))
-model.add(Dropout(0.2))
-model.add(Dense(units=16, activation='relu'))
-model.add(Dense(units=1)) # Output layer for predicting a single energy consumption value
-
-model.compile(optimizer='adam', loss='mean_squared_error')
+model = build_lstm_model(X_train.shape[1], X_train.shape[2],
+                         learning_rate=config.learning_rate, jit_compile=config.jit_compile)
 
 print("Training model (this may take a moment)...")
-# Epochs kept relatively low for rapid prototyping
-history = model.fit(X_train, y_train, epochs=20, batch_size=64, validation_data=(X_test, y_test), verbose=1)
+# Early stopping ends training once val_loss stalls and restores the best epoch's weights
+callbacks, throughput = training_callbacks(config, 'saved_models/checkpoints/lstm_energy_best.h5', len(X_train))
+history = model.fit(X_train, y_train, epochs=config.max_epochs, batch_size=config.batch_size,
+                    validation_data=(X_val, y_val), callbacks=callbacks, verbose=1)
+print(f"Training throughput: {throughput.summary()}")
 
 print("\n7. Saving Models and Encoders for Decision Support Layer...")
 os.makedirs('saved_models', exist_ok=True)
@@ -137,4 +95,14 @@ plt.tight_layout()
 plt.savefig('lstm_evaluation_chart.png', dpi=300)
 print("Saved evaluation chart as 'lstm_evaluation_chart.png'.")
 
+print("\n9. Publishing Run to the Model Registry...")
+# Running prediction screens pick up the new current version without a restart
+version = ModelRegistry().publish(
+    {name: os.path.join('saved_models', name) for name in ['lstm_energy_model.h5', 'scaler_X.pkl', 'scaler_y.pkl', 'label_encoder.pkl']},
+    feature_order=df.drop('energy_consumption', axis=1).columns,
+    metrics={'mae': float(mae), 'rmse': float(rmse), 'epochs': len(history.history['loss'])},
+    time_steps=TIME_STEPS
+)
+print(f"Published model version {version}.")
+
 print("Pipeline Complete! The model and scalers are ready to be loaded by your Tkinter UI.")
\ No newline at end of file
@@ -0,0 +1,125 @@
+import argparse
+import os
+import time
+from dataclasses import dataclass, asdict
+
+import numpy as np
+import tensorflow as tf
+
+# Adam's default rate at the original batch size; also the anchor for optional linear scaling
+BASE_BATCH_SIZE = 64
+BASE_LEARNING_RATE = 0.001
+
+@dataclass
+class TrainingConfig:
+    """CPU training throughput settings shared by the training scripts."""
+    intra_op_threads: int = 0 # 0 lets TensorFlow pick (one per core)
+    inter_op_threads: int = 0
+    jit_compile: bool = False # XLA JIT compilation of the train step
+    float32: bool = True      # Cast scaler output (float64) to float32 before it reaches TensorFlow
+    batch_size: int = BASE_BATCH_SIZE
+    scale_learning_rate: bool = False # Linear scaling rule; off, so a bigger batch does not change the optimizer
+    max_epochs: int = 100
+    patience: int = 5         # Early stopping: epochs without val_loss improvement
+    validation_fraction: float = 0.1 # Tail of the training split that early stopping/checkpoints watch
+    target_loss: float = None # Optional val_loss target for the time-to-target benchmark
+
+    @property
+    def learning_rate(self):
+        """BASE_LEARNING_RATE, grown linearly with the batch size only when scale_learning_rate is set."""
+        if not self.scale_learning_rate:
+            return BASE_LEARNING_RATE
+        return BASE_LEARNING_RATE * self.batch_size / BASE_BATCH_SIZE
+
+    @property
+    def dtype(self):
+        return np.float32 if self.float32 else np.float64
+
+    def as_dict(self):
+        return dict(asdict(self), learning_rate=self.learning_rate)
+
+def parse_training_args(argv=None, **defaults):
+    """Builds a TrainingConfig from the command line; `defaults` override the dataclass defaults.
+
+    Unknown flags are an error, so a typo such as --batchsize is not silently ignored.
+    Scripts with their own options should pass only the leftover arguments as `argv`.
+    """
+    base = TrainingConfig(**defaults)
+    parser = argparse.ArgumentParser(description="LSTM training throughput options")
+    parser.add_argument('--intra-op-threads', type=int, default=base.intra_op_threads)
+    parser.add_argument('--inter-op-threads', type=int, default=base.inter_op_threads)
+    parser.add_argument('--xla', dest='jit_compile', action=argparse.BooleanOptionalAction, default=base.jit_compile)
+    parser.add_argument('--float32', action=argparse.BooleanOptionalAction, default=base.float32)
+    parser.add_argument('--batch-size', type=int, default=base.batch_size)
+    parser.add_argument('--scale-lr', dest='scale_learning_rate', action=argparse.BooleanOptionalAction,
+                        default=base.scale_learning_rate, help=f"Scale the learning rate by batch_size / {BASE_BATCH_SIZE}")
+    parser.add_argument('--max-epochs', type=int, default=base.max_epochs)
+    parser.add_argument('--patience', type=int, default=base.patience)
+    parser.add_argument('--validation-fraction', type=float, default=base.validation_fraction)
+    parser.add_argument('--target-loss', type=float, default=base.target_loss)
+    args = parser.parse_args(argv)
+    return TrainingConfig(**vars(args))
+
+def configure_runtime(config):
+    """Applies threading and XLA settings. Must run before TensorFlow executes its first op."""
+    tf.config.threading.set_intra_op_parallelism_threads(config.intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(config.inter_op_threads)
+    tf.config.optimizer.set_jit(config.jit_compile)
+
+class ThroughputMonitor(tf.keras.callbacks.Callback):
+    """Records training samples/s per epoch and the wall-clock time until val_loss reaches a target.
+
+    The validation pass at the end of each epoch is excluded from the samples/s figure.
+    """
+
+    def __init__(self, n_samples, target_loss=None):
+        super().__init__()
+        self.n_samples = n_samples
+        self.target_loss = target_loss
+        self.epoch_samples_per_sec = []
+        self.time_to_target = None
+
+    def on_train_begin(self, logs=None):
+        self.train_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+        self.validation_time = 0.0
+
+    def on_test_begin(self, logs=None):
+        self.test_start = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        self.validation_time += time.perf_counter() - self.test_start
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self.epoch_start - self.validation_time
+        self.epoch_samples_per_sec.append(self.n_samples / elapsed)
+        val_loss = (logs or {}).get('val_loss')
+        if self.time_to_target is None and self.target_loss is not None and val_loss is not None and val_loss <= self.target_loss:
+            self.time_to_target = time.perf_counter() - self.train_start
+
+    def summary(self):
+        # The first epoch includes graph tracing / XLA compilation, so steady state excludes it
+        steady = self.epoch_samples_per_sec[1:] or self.epoch_samples_per_sec
+        return {
+            'epochs': len(self.epoch_samples_per_sec),
+            'samples_per_sec': float(np.mean(steady)) if steady else 0.0,
+            'time_to_target_loss': self.time_to_target,
+            'total_time': time.perf_counter() - self.train_start
+        }
+
+def training_callbacks(config, checkpoint_path, n_samples):
+    """Early stopping with best-weight restore, a best-only checkpoint and the throughput monitor.
+
+    All of them watch val_loss, so fit() must validate on a holdout carved from the training split
+    (see pipeline_utils.chronological_holdout), never on the test set the final metrics use.
+    """
+    os.makedirs(os.path.dirname(checkpoint_path) or '.', exist_ok=True)
+    monitor = ThroughputMonitor(n_samples, config.target_loss)
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=config.patience, restore_best_weights=True),
+        tf.keras.callbacks.ModelCheckpoint(checkpoint_path, monitor='val_loss', save_best_only=True),
+        monitor
+    ]
+    return callbacks, monitor
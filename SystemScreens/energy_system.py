@@ -3,24 +3,44 @@ from tkinter import ttk, messagebox
 import numpy as np
 import pandas as pd
 import os
-import joblib
-import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import sys
+import time
+import queue
+import threading
+
+from model_router import LoadedModels
+from instrumentation import METRICS, start_metrics_server
+
+# The model registry lives with the training code
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Model"))
+from model_registry import ModelRegistry
 
 try:
     import tensorflow as tf
 except ImportError:
     tf = None
 
+# Column order the scaler and LSTM were fitted on (see Model/train_model.py)
+FEATURE_NAMES = [
+    'avg_temperature', 'humidity', 'co2_emission', 'renewable_share',
+    'urban_population', 'industrial_activity_index', 'energy_price',
+    'day_of_week', 'month_sin', 'month_cos', 'country_encoded'
+]
+TIME_STEPS = 7
+MAX_SWEEP_STEPS = 100 # Per axis, so a 2D grid is capped at 10,000 scenarios
+MODEL_POOL_SIZE = 4 # Per-country models kept loaded at once
+REGISTRY_POLL_MS = 2000 # How often to check the registry for a new current version
+METRICS_PORT_ENV = "ENERGY_METRICS_PORT" # Serve /metrics on this port when set; unset or 0 disables
+
 class EnergyPredictionApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Intelligent Energy Demand Predictor")
         
         # Switched to a standard Widescreen Dashboard resolution
-        self.root.geometry("1280x680")
+        self.root.geometry("1280x760")
         self.root.configure(bg="white")
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
@@ -91,10 +111,43 @@ class EnergyPredictionApp:
         self.predict_btn.pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Clear", command=self.clear_fields, width=8).pack(side="left", padx=5)
 
+        # --- SCENARIO SWEEP: vary one or two inputs over a range in a single batch ---
+        sweep_label = ttk.Label(self.left_panel, text="Scenario Sweep", font=("Helvetica", 12, "bold"), background="#f8f9fa")
+        sweep_label.pack(pady=(0, 5))
+
+        sweep_frame = ttk.Frame(self.left_panel, style="TFrame")
+        sweep_frame.pack(fill="x", padx=20)
+
+        sweep_options = [lbl for lbl, _, _ in self.input_features]
+        for col, heading in enumerate(["Input", "From", "To", "Steps"]):
+            ttk.Label(sweep_frame, text=heading, background="#f8f9fa").grid(row=0, column=col, sticky="w")
+
+        self.sweep_rows = []
+        for row, (options, default_var, default_range) in enumerate([
+            (sweep_options, sweep_options[0], ("-10", "40", "50")),
+            (["None"] + sweep_options, "None", ("0", "60", "20"))
+        ], start=1):
+            var_box = ttk.Combobox(sweep_frame, values=options, state="readonly", width=16)
+            var_box.set(default_var)
+            var_box.grid(row=row, column=0, sticky="w", pady=4)
+            range_entries = []
+            for col, default_val in enumerate(default_range, start=1):
+                entry = ttk.Entry(sweep_frame, width=6)
+                entry.insert(0, default_val)
+                entry.grid(row=row, column=col, sticky="w", pady=4, padx=(5, 0))
+                range_entries.append(entry)
+            self.sweep_rows.append((var_box, range_entries))
+
+        self.sweep_btn = ttk.Button(self.left_panel, text="Run Sweep", command=self.run_sweep, width=15)
+        self.sweep_btn.pack(pady=10)
+
         # --- RIGHT PANEL: ANALYTICS DASHBOARD ---
         header_label = ttk.Label(self.right_panel, text="LSTM Inference Engine", font=("Helvetica", 20, "bold"), background="white")
         header_label.pack(pady=(15, 5))
 
+        self.model_label = ttk.Label(self.right_panel, text="", font=("Helvetica", 10, "italic"), foreground="#7f8c8d", background="white")
+        self.model_label.pack()
+
         self.result_label = ttk.Label(self.right_panel, text="Ready for input...", font=("Helvetica", 22, "bold"), foreground="#7f8c8d", background="white")
         self.result_label.pack(pady=(10, 20))
 
@@ -102,6 +155,14 @@ class EnergyPredictionApp:
         self.graph_frame.pack(fill="both", expand=True, padx=10, pady=10)
         self.canvas_widget = None 
 
+        # --- DEBUG OVERLAY (F12): per-stage latencies and counters; Ctrl+E exports metrics ---
+        self.overlay_label = tk.Label(self.right_panel, text="", font=("Courier", 9), justify="left",
+                                      bg="#2c3e50", fg="#ecf0f1", padx=8, pady=6)
+        self.overlay_visible = False
+        self.root.bind("<F12>", self.toggle_overlay)
+        self.root.bind("<Control-e>", self.export_metrics)
+        self.start_metrics_endpoint()
+
         # --- LOAD DATA ---
         self.load_models()
         self.load_historical_data() 
@@ -119,20 +180,101 @@ class EnergyPredictionApp:
         except Exception:
             self.hist_df = None 
 
+    def set_model_controls(self, state):
+        self.predict_btn.config(state=state)
+        self.sweep_btn.config(state=state)
+
     def load_models(self):
+        self.models = None
         if tf is None:
             messagebox.showerror("Dependency Error", "TensorFlow is not installed.")
+            self.set_model_controls("disabled")
             return
         base_dir = os.path.dirname(os.path.abspath(__file__))
         model_dir = os.path.join(base_dir, "..", "Model", "saved_models")
+
+        self.registry = ModelRegistry(os.path.join(model_dir, "registry"))
+        self.load_results = queue.Queue() # (version, LoadedModels or the exception) from loader threads
+        self.loading_version = None
+
+        # Startup only reads the CURRENT pointer and its manifest; the artifacts load in the background
+        version = self.registry.current_version()
+        if version is not None:
+            self.set_model_controls("disabled")
+            self.model_label.config(text=f"Loading model {version}...")
+            self.start_model_load(version)
+        else:
+            # No registry yet: fall back to the fixed paths written by older training runs
+            try:
+                self.models = self.timed_model_load(model_dir)
+                self.model_label.config(text="Model: saved_models (unversioned)")
+            except Exception as e:
+                messagebox.showwarning("Model Load Error", f"Could not load AI models.\nError: {e}")
+                self.set_model_controls("disabled")
+        self.root.after(REGISTRY_POLL_MS, self.check_model_registry)
+
+    def timed_model_load(self, model_dir, version=None):
+        start = time.perf_counter()
+        models = LoadedModels.load(model_dir, version, pool_capacity=MODEL_POOL_SIZE)
+        elapsed = time.perf_counter() - start
+        METRICS.observe("model_load", elapsed)
+        METRICS.set_gauge("model_load_seconds", elapsed)
+        METRICS.inc("model_loads_total")
+        return models
+
+    def start_model_load(self, version):
+        self.loading_version = version
+        threading.Thread(target=self.load_version_in_background, args=(version,), daemon=True).start()
+
+    def load_version_in_background(self, version):
+        """Worker thread: verifies and loads a registry version without touching any Tk widgets."""
         try:
-            self.model = tf.keras.models.load_model(os.path.join(model_dir, 'lstm_energy_model.h5'))
-            self.scaler_X = joblib.load(os.path.join(model_dir, 'scaler_X.pkl'))
-            self.scaler_y = joblib.load(os.path.join(model_dir, 'scaler_y.pkl'))
-            self.label_encoder = joblib.load(os.path.join(model_dir, 'label_encoder.pkl'))
+            manifest = self.registry.verify(version)
+            if manifest['feature_order'] != FEATURE_NAMES:
+                raise ValueError(f"Feature order {manifest['feature_order']} does not match this screen.")
+            result = self.timed_model_load(self.registry.version_dir(version), version)
         except Exception as e:
-            messagebox.showwarning("Model Load Error", f"Could not load AI models.\nError: {e}")
-            self.predict_btn.config(state="disabled")
+            METRICS.inc("model_load_errors_total")
+            result = e
+        # Handed to the Tk thread, which drops results for versions that are no longer current
+        self.load_results.put((version, result))
+
+    def check_model_registry(self):
+        """Polled on the Tk thread: swaps in a finished load and starts loading a newer current version."""
+        try:
+            current = self.registry.current_version()
+        except OSError:
+            current = None
+
+        while True:
+            try:
+                version, result = self.load_results.get_nowait()
+            except queue.Empty:
+                break
+            if version != current:
+                # CURRENT moved on (or could not be read) after this load started: drop it and start over
+                if version == self.loading_version:
+                    self.loading_version = None
+            elif isinstance(result, Exception):
+                # loading_version stays set, so a broken version is not retried on every poll
+                if self.models is None:
+                    messagebox.showwarning("Model Load Error", f"Could not load model {version}.\nError: {result}")
+                    self.model_label.config(text=f"Model {version} failed to load")
+                else:
+                    # Keep serving the current model; a broken version must not take the screen down
+                    self.model_label.config(text=f"Model: {self.models.version} ({version} rejected: {result})")
+            else:
+                # Single reference swap between events: in-flight requests already finished on this thread
+                self.models = result
+                self.loading_version = None
+                self.model_label.config(text=f"Model: {self.models.version}")
+                self.set_model_controls("normal")
+
+        loaded = self.models.version if self.models is not None else None
+        if current is not None and current not in (loaded, self.loading_version):
+            self.start_model_load(current)
+
+        self.root.after(REGISTRY_POLL_MS, self.check_model_registry)
 
     def perform_drift_analysis(self, country, user_inputs):
         if self.hist_df is None: return {}, []
@@ -155,70 +297,135 @@ class EnergyPredictionApp:
                 warnings.append(f"• {lbl.split(' (')[0]} is unusually {direction} (Z: {z_score:+.1f})")
         return z_scores, warnings
 
+    def collect_inputs(self):
+        """Reads the form into a dict of typed values (raises ValueError on bad numbers)."""
+        inputs = {
+            'country': self.entries['country'].get(),
+            'month': int(self.entries['month'].get()),
+            'day_of_week': int(self.entries['day_of_week'].get())
+        }
+        for _, col, _ in self.input_features:
+            inputs[col] = float(self.entries[col].get())
+        return inputs
+
+    def build_feature_frame(self, scenarios):
+        """Vectorized feature engineering: one row per scenario, in the scaler's column order."""
+        features_df = scenarios.copy()
+        features_df['month_sin'] = np.sin(2 * np.pi * features_df['month'] / 12)
+        features_df['month_cos'] = np.cos(2 * np.pi * features_df['month'] / 12)
+        features_df['country_encoded'] = self.models.label_encoder.transform(features_df['country'])
+        return features_df[FEATURE_NAMES]
+
+    def infer_batch(self, features_df, country):
+        """Scales every scenario at once and runs them through the country's LSTM in a single forward pass."""
+        with METRICS.timed("model_routing"):
+            bundle = self.models.router.get(country)
+        with METRICS.timed("scaling"):
+            scaled_features = bundle.scaler_X.transform(features_df)
+            # Each scenario is held constant across the 7-day window; broadcast avoids copying the rows
+            lstm_input = np.broadcast_to(scaled_features[:, np.newaxis, :],
+                                         (len(scaled_features), TIME_STEPS, scaled_features.shape[1]))
+
+        with METRICS.timed("inference"):
+            scaled_prediction = bundle.model.predict(lstm_input, batch_size=len(lstm_input), verbose=0)
+        with METRICS.timed("inverse_transform"):
+            scaled_pred_df = pd.DataFrame(scaled_prediction, columns=['energy_consumption'])
+            return bundle.scaler_y.inverse_transform(scaled_pred_df)[:, 0]
+
     def predict(self):
         try:
             self.result_label.config(text="Running Inference...", foreground="#e74c3c")
             self.predict_btn.config(state="disabled")
             self.root.update_idletasks()
             
-            inputs = {
-                'country': self.entries['country'].get(),
-                'month': int(self.entries['month'].get()),
-                'day_of_week': int(self.entries['day_of_week'].get()),
-                'avg_temperature': float(self.entries['avg_temperature'].get()),
-                'humidity': float(self.entries['humidity'].get()),
-                'co2_emission': float(self.entries['co2_emission'].get()),
-                'renewable_share': float(self.entries['renewable_share'].get()),
-                'urban_population': float(self.entries['urban_population'].get()),
-                'industrial_activity_index': float(self.entries['industrial_activity_index'].get()),
-                'energy_price': float(self.entries['energy_price'].get())
-            }
+            with METRICS.timed("parse_inputs"):
+                inputs = self.collect_inputs()
             
-            z_scores, drift_warnings = self.perform_drift_analysis(inputs['country'], inputs)
+            with METRICS.timed("drift_analysis"):
+                z_scores, drift_warnings = self.perform_drift_analysis(inputs['country'], inputs)
             if drift_warnings:
+                METRICS.inc("drift_warnings_total", len(drift_warnings))
                 warning_text = "CONCEPT DRIFT WARNING:\nExtreme outliers detected. Prediction may be volatile:\n\n" + "\n".join(drift_warnings)
                 messagebox.showwarning("Data Drift Detected", warning_text)
             
-            month_sin = math.sin(2 * math.pi * inputs['month'] / 12)
-            month_cos = math.cos(2 * math.pi * inputs['month'] / 12)
-            country_encoded = self.label_encoder.transform([inputs['country']])[0]
-            
-            feature_names = [
-                'avg_temperature', 'humidity', 'co2_emission', 'renewable_share', 
-                'urban_population', 'industrial_activity_index', 'energy_price', 
-                'day_of_week', 'month_sin', 'month_cos', 'country_encoded'
-            ]
-            features_df = pd.DataFrame([[
-                inputs['avg_temperature'], inputs['humidity'], inputs['co2_emission'], 
-                inputs['renewable_share'], inputs['urban_population'], 
-                inputs['industrial_activity_index'], inputs['energy_price'], 
-                inputs['day_of_week'], month_sin, month_cos, country_encoded
-            ]], columns=feature_names)
-            
-            scaled_features = self.scaler_X.transform(features_df)
-            TIME_STEPS = 7
-            sequence = np.tile(scaled_features, (TIME_STEPS, 1)) 
-            lstm_input = np.expand_dims(sequence, axis=0)        
-            
-            scaled_prediction = self.model.predict(lstm_input)
-            scaled_pred_df = pd.DataFrame(scaled_prediction, columns=['energy_consumption'])
-            actual_prediction = self.scaler_y.inverse_transform(scaled_pred_df)[0][0]
+            with METRICS.timed("feature_engineering"):
+                features_df = self.build_feature_frame(pd.DataFrame([inputs]))
+            actual_prediction = self.infer_batch(features_df, inputs['country'])[0]
             
             final_text = f"Predicted Demand: {actual_prediction:,.2f} kWh"
             self.result_label.config(text=final_text, foreground="#27ae60")
             self.predict_btn.config(state="normal")
             
-            self.plot_prediction(actual_prediction, inputs['country'], inputs['month'], z_scores)
+            with METRICS.timed("plotting"):
+                self.plot_prediction(actual_prediction, inputs['country'], inputs['month'], z_scores)
+            METRICS.inc("predictions_total")
+            self.refresh_overlay()
             
         except ValueError:
+            METRICS.inc("input_errors_total")
             messagebox.showerror("Input Error", "Please ensure all fields are valid numbers.")
             self.result_label.config(text="Input Error", foreground="#e74c3c")
             self.predict_btn.config(state="normal")
         except Exception as e:
+            METRICS.inc("prediction_errors_total")
             messagebox.showerror("Prediction Error", f"An error occurred:\n{e}")
             self.result_label.config(text="Prediction Failed", foreground="#e74c3c")
             self.predict_btn.config(state="normal")
 
+    def read_sweep_axis(self, var_box, range_entries):
+        """Returns (label, column, values) for one sweep row, or None when the row is unused."""
+        label = var_box.get()
+        if label == "None":
+            return None
+        column = next(col for lbl, col, _ in self.input_features if lbl == label)
+        start, stop = float(range_entries[0].get()), float(range_entries[1].get())
+        steps = int(range_entries[2].get())
+        if not 2 <= steps <= MAX_SWEEP_STEPS:
+            raise ValueError(f"Steps must be between 2 and {MAX_SWEEP_STEPS}.")
+        return label, column, np.linspace(start, stop, steps)
+
+    def run_sweep(self):
+        try:
+            self.result_label.config(text="Running Scenario Sweep...", foreground="#e74c3c")
+            self.sweep_btn.config(state="disabled")
+            self.root.update_idletasks()
+
+            with METRICS.timed("parse_inputs"):
+                inputs = self.collect_inputs()
+                axes = [axis for axis in (self.read_sweep_axis(*row) for row in self.sweep_rows) if axis is not None]
+            if len(axes) == 2 and axes[0][1] == axes[1][1]:
+                raise ValueError("Choose two different inputs for a 2D sweep.")
+
+            # Build the full grid of variants as one frame: every other field keeps its form value
+            grids = np.meshgrid(*[values for _, _, values in axes], indexing='ij')
+            scenarios = pd.DataFrame([inputs]).loc[np.zeros(grids[0].size, dtype=int)].reset_index(drop=True)
+            for (_, column, _), grid in zip(axes, grids):
+                scenarios[column] = grid.ravel()
+
+            with METRICS.timed("feature_engineering"):
+                features_df = self.build_feature_frame(scenarios)
+            predictions = self.infer_batch(features_df, inputs['country']).reshape(grids[0].shape)
+
+            self.result_label.config(text=f"Sweep Complete: {predictions.size:,} scenarios", foreground="#27ae60")
+            self.sweep_btn.config(state="normal")
+
+            with METRICS.timed("plotting"):
+                self.plot_sweep(axes, predictions, inputs)
+            METRICS.inc("sweeps_total")
+            METRICS.inc("sweep_scenarios_total", predictions.size)
+            self.refresh_overlay()
+
+        except ValueError as e:
+            METRICS.inc("input_errors_total")
+            messagebox.showerror("Input Error", f"Please check the sweep settings.\n{e}")
+            self.result_label.config(text="Input Error", foreground="#e74c3c")
+            self.sweep_btn.config(state="normal")
+        except Exception as e:
+            METRICS.inc("prediction_errors_total")
+            messagebox.showerror("Sweep Error", f"An error occurred:\n{e}")
+            self.result_label.config(text="Sweep Failed", foreground="#e74c3c")
+            self.sweep_btn.config(state="normal")
+
     def plot_prediction(self, predicted_val, country, month, z_scores):
         if self.canvas_widget:
             self.canvas_widget.destroy()
@@ -275,6 +482,41 @@ class EnergyPredictionApp:
         self.canvas_widget = canvas.get_tk_widget()
         self.canvas_widget.pack(fill="both", expand=True)
 
+    def plot_sweep(self, axes, predictions, inputs):
+        if self.canvas_widget:
+            self.canvas_widget.destroy()
+
+        fig, ax = plt.subplots(figsize=(12, 5.5))
+
+        if len(axes) == 1:
+            label, column, values = axes[0]
+            ax.plot(values, predictions, color='#27ae60', linewidth=2)
+            # Mark where the current form value sits on the response curve
+            ax.axvline(x=inputs[column], color='#95a5a6', linestyle='--', linewidth=1.5, label='Current Input')
+            ax.set_xlabel(label, fontsize=11)
+            ax.set_ylabel("Predicted Energy (kWh)", fontsize=11)
+            ax.legend(loc='upper right')
+            ax.grid(True, linestyle=':', alpha=0.6)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.set_title(f"Demand Response to {label.split(' (')[0]} ({inputs['country']})", fontsize=13, pad=10)
+        else:
+            (x_label, _, x_values), (y_label, _, y_values) = axes
+            # predictions is indexed [x, y]; imshow wants rows on the vertical axis
+            heatmap = ax.imshow(predictions.T, origin='lower', aspect='auto', cmap='viridis',
+                                extent=[x_values[0], x_values[-1], y_values[0], y_values[-1]])
+            fig.colorbar(heatmap, ax=ax, label="Predicted Energy (kWh)")
+            ax.set_xlabel(x_label, fontsize=11)
+            ax.set_ylabel(y_label, fontsize=11)
+            ax.set_title(f"Demand Surface: {x_label.split(' (')[0]} vs {y_label.split(' (')[0]} ({inputs['country']})", fontsize=13, pad=10)
+
+        fig.tight_layout(pad=3.0)
+
+        canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
+        canvas.draw()
+        self.canvas_widget = canvas.get_tk_widget()
+        self.canvas_widget.pack(fill="both", expand=True)
+
     def clear_fields(self):
         for entry in self.entries.values():
             if isinstance(entry, ttk.Combobox):
@@ -285,6 +527,43 @@ class EnergyPredictionApp:
         if self.canvas_widget:
             self.canvas_widget.destroy()
 
+    def start_metrics_endpoint(self):
+        # Metrics are optional: a bad port setting or a port in use must not stop the screen opening
+        port_setting = os.environ.get(METRICS_PORT_ENV, "0")
+        try:
+            port = int(port_setting)
+            if port:
+                start_metrics_server(port)
+        except (ValueError, OverflowError, OSError) as e:
+            messagebox.showwarning("Metrics Disabled", f"Could not serve metrics on port '{port_setting}'.\nError: {e}")
+
+    def toggle_overlay(self, event=None):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.refresh_overlay()
+            self.overlay_label.place(relx=1.0, rely=1.0, anchor="se")
+            self.overlay_label.lift()
+        else:
+            self.overlay_label.place_forget()
+
+    def refresh_overlay(self):
+        if self.overlay_visible:
+            self.overlay_label.config(text=METRICS.overlay_text() or "No measurements yet")
+            self.overlay_label.lift()
+
+    def export_metrics(self, event=None):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        prom_path = os.path.join(base_dir, "prediction_metrics.prom")
+        json_path = os.path.join(base_dir, "prediction_metrics.json")
+        try:
+            with open(prom_path, "w") as f:
+                f.write(METRICS.export_prometheus())
+            with open(json_path, "w") as f:
+                f.write(METRICS.export_json())
+            messagebox.showinfo("Metrics Exported", f"Saved metrics to:\n{prom_path}\n{json_path}")
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Could not write metrics.\nError: {e}")
+
     def on_closing(self):
         plt.close('all') 
         self.root.quit()
@@ -0,0 +1,138 @@
+import time
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, from sub-millisecond scaling up to slow first-call model loads
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "energy_"
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.last = value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q):
+        """Approximate quantile: the upper bound of the bucket that contains it.
+
+        Returns None when it falls in the unbounded overflow bucket (above the largest bound).
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets, self.counts):
+            if cumulative >= rank:
+                return bound
+        return None
+
+class Metrics:
+    """Counters, gauges and per-stage latency histograms for the prediction path."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            self.histograms.setdefault(stage, Histogram()).observe(seconds)
+
+    @contextmanager
+    def timed(self, stage):
+        """Records the wall time of the block under `stage`, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def export_prometheus(self):
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                lines += [f"# TYPE {METRIC_PREFIX}{name} counter", f"{METRIC_PREFIX}{name} {value}"]
+            for name, value in sorted(self.gauges.items()):
+                lines += [f"# TYPE {METRIC_PREFIX}{name} gauge", f"{METRIC_PREFIX}{name} {value}"]
+            name = f"{METRIC_PREFIX}stage_latency_seconds"
+            lines.append(f"# TYPE {name} histogram")
+            for stage, hist in sorted(self.histograms.items()):
+                for bound, cumulative in zip(hist.buckets, hist.counts):
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {hist.sum}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def export_json(self):
+        with self.lock:
+            return json.dumps({
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'latency_seconds': {
+                    stage: {'count': h.count, 'sum': h.sum, 'last': h.last,
+                            'p50': h.quantile(0.5), 'p95': h.quantile(0.95),
+                            'buckets': dict(zip(map(str, h.buckets), h.counts))}
+                    for stage, h in self.histograms.items()
+                }
+            }, indent=2, allow_nan=False)
+
+    def overlay_text(self):
+        """Short per-stage summary for the on-screen debug overlay."""
+        with self.lock:
+            rows = [f"{stage:<18} last {h.last * 1000:8.1f} ms   avg {h.sum / h.count * 1000:8.1f} ms   n={h.count}"
+                    for stage, h in self.histograms.items()]
+            rows += [f"{name:<18} {value}" for name, value in sorted(self.counters.items())]
+            rows += [f"{name:<18} {value:.3f}" for name, value in sorted(self.gauges.items())]
+        return "\n".join(rows)
+
+# Shared by every screen in the process
+METRICS = Metrics()
+
+def start_metrics_server(port, metrics=METRICS):
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = metrics.export_prometheus(), 'text/plain; version=0.0.4'
+            elif self.path == '/metrics.json':
+                body, content_type = metrics.export_json(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass # Keep scrapes out of the console
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,81 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+import joblib
+
+class ModelBundle:
+    """The LSTM and the scalers it was trained with, used together for one prediction."""
+
+    def __init__(self, model, scaler_X, scaler_y):
+        self.model = model
+        self.scaler_X = scaler_X
+        self.scaler_y = scaler_y
+
+    @classmethod
+    def load(cls, model_dir):
+        import tensorflow as tf
+        return cls(
+            tf.keras.models.load_model(os.path.join(model_dir, 'lstm_energy_model.h5')),
+            joblib.load(os.path.join(model_dir, 'scaler_X.pkl')),
+            joblib.load(os.path.join(model_dir, 'scaler_y.pkl'))
+        )
+
+class CountryModelRouter:
+    """Dispatches each prediction to its country's model (see Model/train_country_models.py).
+
+    Loaded models live in an LRU pool of at most `capacity` entries; countries without
+    a dedicated model, or a missing countries/index.json, fall back to the global model.
+    """
+
+    def __init__(self, country_dir, fallback, capacity=4):
+        self.country_dir = country_dir
+        self.fallback = fallback
+        self.capacity = capacity
+        self.pool = OrderedDict()
+        self.lock = threading.Lock()
+        self.group_of = {}
+
+        index_path = os.path.join(country_dir, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.group_of = json.load(f)['groups']
+
+    def get(self, country):
+        group = self.group_of.get(country)
+        if group is None:
+            return self.fallback
+
+        with self.lock:
+            if group in self.pool:
+                self.pool.move_to_end(group) # Mark as most recently used
+                return self.pool[group]
+
+        bundle = ModelBundle.load(os.path.join(self.country_dir, group))
+
+        with self.lock:
+            self.pool[group] = bundle
+            self.pool.move_to_end(group)
+            while len(self.pool) > self.capacity:
+                self.pool.popitem(last=False) # Evict the least recently used model
+        return bundle
+
+class LoadedModels:
+    """Everything one model version serves: the country router and its label encoder.
+
+    The prediction screen swaps the whole object at once, so a request never mixes versions.
+    """
+
+    def __init__(self, router, label_encoder, version=None):
+        self.router = router
+        self.label_encoder = label_encoder
+        self.version = version
+
+    @classmethod
+    def load(cls, model_dir, version=None, pool_capacity=4):
+        global_model = ModelBundle.load(model_dir)
+        label_encoder = joblib.load(os.path.join(model_dir, 'label_encoder.pkl'))
+        # Requests go to a per-country model when one was trained, otherwise to the global model
+        router = CountryModelRouter(os.path.join(model_dir, 'countries'), global_model, capacity=pool_capacity)
+        return cls(router, label_encoder, version)
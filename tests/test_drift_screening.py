@@ -0,0 +1,91 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Model"))
+
+from drift_screening import (
+    population_stability_index, ks_statistic, screen_file, summarize,
+    DRIFT_FEATURES, MIN_ROWS_FOR_DISTRIBUTION
+)
+
+DATA_FILE = os.path.join(ROOT, "Climate_Energy_Consumption_Dataset_2020_2024.csv")
+
+@pytest.fixture(scope="module")
+def reference():
+    return pd.read_csv(DATA_FILE)
+
+def sample_per_country(reference, n, seed=0):
+    return reference.groupby("country").sample(n=n, random_state=seed)
+
+def test_psi_is_near_zero_for_same_distribution():
+    rng = np.random.default_rng(0)
+    assert population_stability_index(rng.normal(size=5000), rng.normal(size=5000)) < 0.02
+
+def test_psi_flags_shifted_distribution():
+    rng = np.random.default_rng(0)
+    assert population_stability_index(rng.normal(size=5000), rng.normal(loc=2.0, size=5000)) > 0.25
+
+def test_ks_statistic_bounds():
+    values = np.arange(100, dtype=float)
+    assert ks_statistic(values, values) == 0.0
+    assert ks_statistic(values, values + 1000) == 1.0
+
+def test_sample_of_reference_passes(reference):
+    report = screen_file(sample_per_country(reference, 300), reference, workers=1)
+    assert summarize(report)["passed"]
+    assert (report["status"] == "ok").all()
+
+def test_small_nightly_file_is_not_rejected(reference):
+    last_day = reference[reference["date"] == reference["date"].max()]
+    report = screen_file(last_day, reference, workers=1)
+    assert summarize(report)["passed"]
+    assert report["psi"].isna().all()
+    assert set(report["status"]) <= {"insufficient", "warn"}
+
+def test_below_min_rows_skips_distribution_checks(reference):
+    report = screen_file(sample_per_country(reference, MIN_ROWS_FOR_DISTRIBUTION - 1), reference, workers=1)
+    assert summarize(report)["passed"]
+    assert report["ks"].isna().all()
+
+def test_shifted_feature_fails(reference):
+    incoming = sample_per_country(reference, 300).copy()
+    incoming["energy_price"] *= 3
+    report = screen_file(incoming, reference, workers=1)
+    assert not summarize(report)["passed"]
+    failed = report[report["status"] == "fail"]
+    assert set(failed["feature"]) == {"energy_price"}
+
+def test_missing_values_fail_even_on_small_files(reference):
+    last_day = reference[reference["date"] == reference["date"].max()].copy()
+    last_day.loc[last_day["country"] == "Germany", "humidity"] = np.nan
+    report = screen_file(last_day, reference, workers=1)
+    failed = report[report["status"] == "fail"]
+    assert failed[["country", "feature"]].values.tolist() == [["Germany", "humidity"]]
+
+def test_unknown_country_fails(reference):
+    incoming = sample_per_country(reference, 300)
+    incoming.iloc[0, incoming.columns.get_loc("country")] = "Atlantis"
+    summary = summarize(screen_file(incoming, reference, workers=1))
+    assert {"country": "Atlantis", "feature": "*"} in summary["failures"]
+
+def test_missing_column_raises(reference):
+    with pytest.raises(ValueError):
+        screen_file(reference.drop(columns=["humidity"]), reference, workers=1)
+
+def test_empty_file_fails(reference):
+    summary = summarize(screen_file(reference.head(0), reference, workers=1))
+    assert not summary["passed"]
+    assert summary["rows_screened"] == 0
+    assert summary["failures"] == [{"country": "*", "feature": "*"}]
+
+def test_process_pool_matches_inline(reference):
+    incoming = sample_per_country(reference, 250)
+    inline = screen_file(incoming, reference, workers=1)
+    pooled = screen_file(incoming, reference, workers=2)
+    pd.testing.assert_frame_equal(inline, pooled)
+    assert len(inline) == reference["country"].nunique() * len(DRIFT_FEATURES)